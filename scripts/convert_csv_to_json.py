@@ -6,55 +6,55 @@ Script to convert CSV files to NocoDB API JSON format
 import csv
 import json
 import os
-from datetime import datetime, timezone, timedelta
-import hashlib
-import uuid
+import time
+import multiprocessing as mp
 
-# Add IST timezone (UTC+5:30)
-IST = timezone(timedelta(hours=5, minutes=30))
+# orjson is optional; fall back to the stdlib json module when it is unavailable
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
-def generate_record_id():
-    """Generate a unique record ID in NocoDB format"""
-    return f"rec{uuid.uuid4().hex[:13]}"
+CSV_DIR = "csv"
+JSON_DIR = os.path.join("json", "edge", "en")
 
-def generate_record_hash():
-    """Generate a record hash"""
-    # use IST for consistency
-    return hashlib.md5(f"{datetime.now(IST).isoformat()}{uuid.uuid4()}".encode()).hexdigest()
+# IST (UTC+5:30), precomputed so timestamps need no tzinfo conversion
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+IST_OFFSET_STR = "+05:30"
 
-def convert_csv_to_nocodb_json(csv_file_path, table_name):
-    """Convert a CSV file to NocoDB API JSON format"""
-    records = []
-    
-    with open(csv_file_path, 'r', encoding='utf-8-sig') as csvfile:
-        # Read the CSV
-        reader = csv.DictReader(csvfile)
-        
-        for index, row in enumerate(reader, start=1):
-            # Convert empty strings to None for consistency with example
-            cleaned_row = {}
-            for key, value in row.items():
-                cleaned_row[key.strip()] = value.strip() if value.strip() else None
-            
-            # Create record in NocoDB format
-            now_ist = datetime.now(IST).isoformat(timespec='seconds').replace('T', ' ')
-            record = {
-                "Id": index,
-                "ncRecordId": generate_record_id(),
-                "ncRecordHash": generate_record_hash(),
-                **cleaned_row,
-                "CreatedAt": now_ist,
-                "UpdatedAt": now_ist
-            }
-            
-            records.append(record)
-    
-    # Calculate page info
-    total_rows = len(records)
-    
-    # Create the final JSON structure
-    result = {
-        "list": records,
+def format_ist_timestamp(ts=None):
+    """Format a POSIX timestamp as 'YYYY-MM-DD HH:MM:SS+05:30' in IST"""
+    if ts is None:
+        ts = time.time()
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts + IST_OFFSET_SECONDS)) + IST_OFFSET_STR
+
+# Random bytes consumed per record: 7 for the ID (13 hex chars), 16 for the hash
+RECORD_ID_BYTES = 7
+RECORD_HASH_BYTES = 16
+RECORD_RANDOM_BYTES = RECORD_ID_BYTES + RECORD_HASH_BYTES
+
+def generate_record_ids(count):
+    """Generate (ncRecordId, ncRecordHash) pairs for count records from one os.urandom call"""
+    raw = os.urandom(RECORD_RANDOM_BYTES * count).hex()
+    step = RECORD_RANDOM_BYTES * 2
+    id_end = RECORD_ID_BYTES * 2
+    return [
+        (f"rec{raw[i:i + 13]}", raw[i + id_end:i + step])
+        for i in range(0, step * count, step)
+    ]
+
+# Rows per os.urandom call when generating record IDs while streaming
+RECORD_ID_BATCH = 1024
+
+def dumps_indented(data):
+    """Serialize data as 2-space indented JSON text (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def build_page_info(total_rows):
+    """Build the pageInfo/stats trailer of a NocoDB list response"""
+    return {
         "pageInfo": {
             "totalRows": total_rows,
             "page": 1,
@@ -66,39 +66,107 @@ def convert_csv_to_nocodb_json(csv_file_path, table_name):
             "dbQueryTime": "1.234"
         }
     }
+
+def iter_nocodb_records(csv_file_path):
+    """Yield the rows of a CSV file one at a time as NocoDB records"""
+    # All rows in one conversion share a single batch timestamp (IST)
+    now_ist = format_ist_timestamp()
     
-    return result
+    with open(csv_file_path, 'r', encoding='utf-8-sig') as csvfile:
+        # Read the CSV; headers are parsed once and rows kept as plain lists
+        reader = csv.reader(csvfile)
+        headers = [header.strip() for header in next(reader, [])]
+        width = len(headers)
+        ids = iter(())
+        
+        # Skip blank lines, as csv.DictReader does
+        for index, row in enumerate((row for row in reader if row), start=1):
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            ids_pair = next(ids, None)
+            if ids_pair is None:
+                ids = iter(generate_record_ids(RECORD_ID_BATCH))
+                ids_pair = next(ids)
+            rec_id, rec_hash = ids_pair
+            # Create record in NocoDB format, filling it in place (key order: metadata, columns, timestamps)
+            record = {
+                "Id": index,
+                "ncRecordId": rec_id,
+                "ncRecordHash": rec_hash,
+            }
+            # Convert empty/whitespace-only strings to None for consistency with example;
+            # isspace() tests emptiness without building a stripped copy
+            for key, value in zip(headers, row):
+                record[key] = None if not value or value.isspace() else value.strip()
+            record["CreatedAt"] = now_ist
+            record["UpdatedAt"] = now_ist
+            
+            yield record
+
+def write_nocodb_json(csv_file_path, json_path):
+    """
+    Stream a CSV file to json_path in NocoDB API JSON format, one record at a time,
+    so memory stays bounded by a single row. Output matches json.dump(..., indent=2).
+    """
+    total_rows = 0
+    # Stream into a temp file and os.replace it into place so a failed run never leaves a partial JSON
+    tmp_path = json_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as jsonfile:
+            jsonfile.write('{\n  "list": [')
+            for record in iter_nocodb_records(csv_file_path):
+                # Records sit two levels deep, so re-indent each pretty-printed record by 4 spaces
+                jsonfile.write((',' if total_rows else '') + '\n    ')
+                jsonfile.write(dumps_indented(record).replace('\n', '\n    '))
+                total_rows += 1
+            jsonfile.write('\n  ]' if total_rows else ']')
+            # Splice the trailer's keys in after the list, dropping its opening brace
+            jsonfile.write(',\n' + dumps_indented(build_page_info(total_rows))[2:])
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        # Don't leave the half-written temp file next to the published JSONs
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return total_rows
+
+def _process_one(csv_path):
+    """Convert one CSV file and write its JSON; returns (filename, ok, message)"""
+    filename = os.path.basename(csv_path)
+    table_name = filename[:-4]  # Remove .csv extension
+    try:
+        # Save JSON file, streaming records straight from the CSV
+        json_filename = f"{table_name}.json"
+        json_path = os.path.join(JSON_DIR, json_filename)
+        write_nocodb_json(csv_path, json_path)
+        
+        return filename, True, f"Created {json_filename}"
+        
+    except Exception as e:
+        return filename, False, f"Error processing {filename}: {str(e)}"
 
 def main():
     """Main function to process all CSV files"""
-    csv_dir = "csv"
-    json_dir = os.path.join("json", "edge", "en")
-    
     # Create json/en directory if it doesn't exist
-    os.makedirs(json_dir, exist_ok=True)
+    os.makedirs(JSON_DIR, exist_ok=True)
     
-    # Process each CSV file
-    for filename in os.listdir(csv_dir):
-        if filename.endswith('.csv'):
-            csv_path = os.path.join(csv_dir, filename)
-            table_name = filename[:-4]  # Remove .csv extension
-            
-            print(f"Converting {filename} to JSON...")
-            
-            try:
-                json_data = convert_csv_to_nocodb_json(csv_path, table_name)
-                
-                # Save JSON file
-                json_filename = f"{table_name}.json"
-                json_path = os.path.join(json_dir, json_filename)
-                
-                with open(json_path, 'w', encoding='utf-8') as jsonfile:
-                    json.dump(json_data, jsonfile, indent=2, ensure_ascii=False)
-                
-                print(f"✓ Created {json_filename}")
-                
-            except Exception as e:
-                print(f"✗ Error processing {filename}: {str(e)}")
+    csv_paths = sorted(
+        os.path.join(CSV_DIR, filename)
+        for filename in os.listdir(CSV_DIR)
+        if filename.endswith('.csv')
+    )
+    if not csv_paths:
+        print("No CSV files to convert.")
+        return
+    
+    print(f"Converting {len(csv_paths)} CSV files to JSON...")
+    
+    # Each CSV is independent, so convert them across worker processes
+    with mp.Pool(min(len(csv_paths), mp.cpu_count())) as pool:
+        for filename, ok, msg in pool.imap_unordered(_process_one, csv_paths):
+            print(f"{'✓' if ok else '✗'} {msg}")
     
     print("\nConversion complete!")
 
@@ -12,6 +12,8 @@ Selective mode for CI:
     - Translate only changed menu files.
     - Copy only changed laundry files.
 - Use --parity-only to skip translation entirely and only copy laundry files (no API needed).
+- Use --mode single to translate one record per request instead of one request per file.
+- Outputs already translated from an unchanged source are skipped on reruns; use --force to redo them.
 
 Requirements:
 - pip install -r requirements.txt (only needed for translation)
@@ -30,21 +32,82 @@ Usage (PowerShell):
 """
 import os
 import json
-import glob
+import hashlib
+import math
+import random
+import re
+import shutil
+import threading
 import time
 import argparse
-from typing import Dict, List, Any, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing.pool import ThreadPool
+from typing import Dict, List, Any, Callable, NamedTuple, Optional, Set, Tuple, Union
+
+# orjson is optional; fall back to the stdlib json module when it is unavailable
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
 # Import Gemini SDK lazily only when translation is required
 genai = None  # type: ignore
 gemini_client = None
 
+
+def _env_number(name: str, default: float, minimum: float) -> float:
+    """
+    Numeric setting from the environment, clamped to at least minimum. Malformed values
+    fall back to default with a warning instead of failing at import (even --parity-only).
+    """
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value):
+        print(f"Ignoring {name}={raw!r}: expected a number; using {default:g}")
+        return default
+    return max(minimum, value)
+
+
 SRC_DIR = os.path.join("json", "edge", "en")
 OUT_DIRS = {
     "ta": os.path.join("json", "edge", "ta"),
     "hi": os.path.join("json", "edge", "hi"),
 }
+# Parity copies are I/O-bound, so threads are enough to overlap them
+PARITY_COPY_WORKERS = 8
+# Source JSONs are read ahead on a few threads while earlier files are already translating
+SOURCE_LOAD_WORKERS = 8
+# Concurrent Gemini requests; kept small to stay under API rate limits
+TRANSLATE_WORKERS = int(_env_number("GEMINI_MAX_WORKERS", 8, 1))
+# Shared across every thread (file/lang tasks and per-record fan-out) to cap in-flight requests
+_REQUEST_SLOTS = threading.BoundedSemaphore(TRANSLATE_WORKERS)
+# Attempts per request for transient errors (429/5xx/network) and malformed responses,
+# with exponential backoff between them
+MAX_ATTEMPTS = 4
+BACKOFF_INITIAL_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+# Share of checked cells allowed to lack the target script: above it a strict retry is made,
+# and if the result is still above it the file is failed rather than saved as a translation
+MAX_TRANSLITERATED_SHARE = 0.25
+# Average request rate allowed by the API quota (requests per minute); 0 disables limiting
+REQUESTS_PER_MINUTE = _env_number("GEMINI_RPM", 60, 0)
 MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-3.1-flash-lite-preview")
+# Translated outputs keyed by source content, language, model and --mode; reruns on unchanged sources skip the API
+CACHE_DIR = os.path.join(".cache", "translate")
+# Per-language translations of individual menu lines, shared across files and runs
+LINE_CACHE_PATH = os.path.join(CACHE_DIR, "lines.json")
+_line_cache: Optional[Dict[str, Dict[str, str]]] = None
+_line_cache_lock = threading.Lock()
+# Output path -> cache key it was last written from; lets reruns skip finished work (see --force)
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+_manifest: Optional[Dict[str, str]] = None
+_manifest_lock = threading.Lock()
 
 MENU_FIELDS = ["Day", "Breakfast", "Lunch", "Snacks", "Dinner"]
 # Only these fields should be translated; 'Day' must remain exactly as-is
@@ -65,18 +128,88 @@ SCRIPT_HINTS = {
     "ta": "Use Tamil script for Tamil (e.g., தமிழ்). Do NOT use Latin letters for words.",
 }
 
+# Prepended to the prompt when retrying a response that looks transliterated
+STRICT_PREFIX = "STRICT: Use only the native script (no Latin letters) for words. Keep numbers and punctuation as-is."
+
+# Task instructions per request kind; see prompt_prefix
+PROMPT_INSTRUCTIONS = {
+    "fields": (
+        "Translate the JSON values in 'fields' to the target language using its native script.\n"
+        "Return the translated 'fields' object with exactly the same keys."
+    ),
+    "items": (
+        "You will receive an array named 'items' of menu lines (strings). Translate each string to the "
+        "target language using its native script. "
+        "Keep numbers, commas, slashes, hyphens, and parentheses exactly as-is. "
+        "Do NOT add or remove items, do NOT reorder: 'items' in the response must have the same length "
+        "and order as the input."
+    ),
+}
+
+# Precompiled script classifiers for the transliteration check. They match runs rather than
+# single characters, so counting sums a few run lengths instead of building a list per character.
+_TARGET_SCRIPT_RE = {
+    "hi": re.compile(r"[\u0900-\u097F]+"),  # Devanagari
+    "ta": re.compile(r"[\u0B80-\u0BFF]+"),  # Tamil
+}
+_LATIN_RE = re.compile(r"[A-Za-z]+")
+
+
+def _count_matching(pattern: "re.Pattern[str]", text: str) -> int:
+    """Characters of text covered by pattern; run patterns (`[...]+`) keep findall's match list short."""
+    return sum(map(len, pattern.findall(text)))
+
+
+class TranslationError(RuntimeError):
+    """A Gemini request kept failing after all retry attempts."""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: allows bursts of up to `burst` requests, refilled at
+    rate_per_minute / 60 tokens per second. The default burst of 1 spaces requests
+    evenly, so no 60 s window sees much more than rate_per_minute of them.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float = 1.0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_RATE_LIMITER = RateLimiter(REQUESTS_PER_MINUTE)
+
 
 def ensure_dirs(langs: List[str]):
     for lang in langs:
         os.makedirs(OUT_DIRS[lang], exist_ok=True)
 
 
+# Classification is by name only, so cache it: the same paths are checked by several filters
+@functools.lru_cache(maxsize=4096)
 def is_menu_file(filename: str) -> bool:
     base = os.path.basename(filename)
     name, _ = os.path.splitext(base)
     return ("-M-" in name) or ("-W-" in name)
 
 
+@functools.lru_cache(maxsize=4096)
 def is_laundry_file(filename: str) -> bool:
     base = os.path.basename(filename)
     name, _ = os.path.splitext(base)
@@ -85,63 +218,316 @@ def is_laundry_file(filename: str) -> bool:
 
 
 def load_json(path: str) -> Dict[str, Any]:
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
 def save_json(path: str, data: Dict[str, Any]):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Write to a temp file and os.replace it into place (atomic on POSIX and Windows),
+    # so a crash mid-write never leaves a truncated file that a rerun would trust
+    tmp_path = path + ".tmp"
+    try:
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def replace_with_copy(src_path: str, dst_path: str):
+    """Copy src_path over dst_path through a temp file and os.replace, so dst is never left partial."""
+    tmp_path = dst_path + ".tmp"
+    try:
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def _discard(path: str):
+    """Remove a leftover temp file, if it was created at all."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def loads_json(text: Union[str, bytes]) -> Any:
+    """Parse JSON text (orjson when available); raises json.JSONDecodeError either way."""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumps_compact(data: Any) -> str:
+    """Serialize data as compact JSON text for prompts (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def output_path(src_path: str, lang: str) -> str:
+    return os.path.join(OUT_DIRS[lang], os.path.basename(src_path))
 
 
 def copy_file(src_path: str, lang: str) -> str:
-    base = os.path.basename(src_path)
-    out_path = os.path.join(OUT_DIRS[lang], base)
+    out_path = output_path(src_path, lang)
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(src_path, "r", encoding="utf-8") as fsrc, open(out_path, "w", encoding="utf-8") as fdst:
-        fdst.write(fsrc.read())
+    # Byte-for-byte copy; uses os.sendfile on Linux so no data passes through Python
+    shutil.copyfile(src_path, out_path)
     return out_path
 
 
+def copy_to_langs(src_path: str, langs: List[str]) -> Tuple[str, List[str]]:
+    """Copy one source file into every language directory; returns (src_path, out_paths)."""
+    return src_path, [copy_file(src_path, lang) for lang in langs]
+
+
+def copy_parity_files(paths: List[str], langs: List[str], label: str = ""):
+    """Copy files 1:1 for parity, overlapping the file I/O across a small thread pool."""
+    with ThreadPool(min(len(paths), PARITY_COPY_WORKERS)) as pool:
+        results = pool.imap_unordered(functools.partial(copy_to_langs, langs=langs), paths)
+        for idx, (path, out_paths) in enumerate(results, 1):
+            print(f"[{label}{idx}/{len(paths)}] {os.path.basename(path)}")
+            for lang, outp in zip(langs, out_paths):
+                print(f"  -> {lang}: {outp}")
+
+
+def translation_cache_key(source: bytes, lang: str, mode: str = "batch") -> str:
+    """sha256(source bytes, lang, MODEL_NAME, mode): identifies one translated output."""
+    h = hashlib.sha256(source)
+    h.update(f"\0{lang}\0{MODEL_NAME}\0{mode}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def translation_cache_path(cache_key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{cache_key}.json")
+
+
+def _load_manifest() -> Dict[str, str]:
+    """Load the resume manifest on first use; callers hold _manifest_lock."""
+    global _manifest
+    if _manifest is None:
+        try:
+            _manifest = load_json(MANIFEST_PATH)
+        except (FileNotFoundError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def is_up_to_date(out_path: str, cache_key: str) -> bool:
+    """True if out_path exists and the manifest says it was written from this exact source/lang/model/mode."""
+    with _manifest_lock:
+        return _load_manifest().get(out_path) == cache_key and os.path.exists(out_path)
+
+
+def record_output(out_path: str, cache_key: str):
+    """Record a finished output in the manifest, persisting it atomically."""
+    with _manifest_lock:
+        _load_manifest()[out_path] = cache_key
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        save_json(MANIFEST_PATH, _manifest)
+
+
+def _line_cache_key(line: str) -> str:
+    return hashlib.sha1(f"{MODEL_NAME}\0{line}".encode("utf-8")).hexdigest()
+
+
+def _load_line_cache() -> Dict[str, Dict[str, str]]:
+    """Load the line cache from disk on first use; callers hold _line_cache_lock."""
+    global _line_cache
+    if _line_cache is None:
+        try:
+            _line_cache = load_json(LINE_CACHE_PATH)
+        except (FileNotFoundError, ValueError):
+            _line_cache = {}
+    return _line_cache
+
+
+def cached_line_translations(lines: List[str], lang: str) -> Dict[str, str]:
+    """Return the cached translations (for MODEL_NAME) of whichever lines have one."""
+    with _line_cache_lock:
+        by_lang = _load_line_cache().get(lang, {})
+        found: Dict[str, str] = {}
+        for line in lines:
+            translated = by_lang.get(_line_cache_key(line))
+            if translated is not None:
+                found[line] = translated
+        return found
+
+
+def store_line_translations(translations: Dict[str, str], lang: str):
+    """Add line translations to the cache and persist it atomically."""
+    if not translations:
+        return
+    with _line_cache_lock:
+        by_lang = _load_line_cache().setdefault(lang, {})
+        for line, translated in translations.items():
+            by_lang[_line_cache_key(line)] = translated
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        save_json(LINE_CACHE_PATH, _line_cache)
+
+
 def build_translation_payload(record: Dict[str, Any], fields_to_translate: List[str]) -> Dict[str, Any]:
-    payload = {}
-    for key in fields_to_translate:
-        val = record.get(key)
-        if val is None:
-            payload[key] = None
-        else:
-            payload[key] = str(val)
-    return payload
+    # Values are nearly always str already; only coerce the rest (None stays None)
+    return {
+        k: (v if v is None or isinstance(v, str) else str(v))
+        for k in fields_to_translate
+        for v in (record.get(k),)
+    }
 
 
 def _has_target_script(text: str, lang: str) -> bool:
     if not isinstance(text, str) or not text:
         return False
-    # Unicode ranges
-    ranges = {
-        "hi": [(0x0900, 0x097F)],  # Devanagari
-        "ta": [(0x0B80, 0x0BFF)],  # Tamil
-    }
-    latin = 0
-    target = 0
-    total_letters = 0
-    for ch in text:
-        code = ord(ch)
-        if (65 <= code <= 90) or (97 <= code <= 122):
-            latin += 1
-            total_letters += 1
-        # count letters in target ranges
-        for lo, hi in ranges.get(lang, []):
-            if lo <= code <= hi:
-                target += 1
-                total_letters += 1
-                break
-    # Heuristic: require some target script and avoid high latin proportion
-    if target >= 10:
+    target_re = _TARGET_SCRIPT_RE.get(lang)
+    if target_re is None:
+        return False
+    # Count matches in the regex engine rather than looping over characters in Python
+    target = _count_matching(target_re, text)
+    latin = _count_matching(_LATIN_RE, text)
+    total_letters = target + latin
+    # Nothing to judge (numbers/punctuation only); otherwise require mostly target-script letters.
+    # A ratio, unlike a fixed character count, does not fail short items such as "Tea" or "Milk".
+    if total_letters == 0:
         return True
-    if target >= 5 and (latin == 0 or target / max(1, (latin + target)) >= 0.6):
+    return target / total_letters >= 0.6
+
+
+def _transliterated_cells(
+    src_list: List[Dict[str, Any]],
+    out_list: List[Dict[str, Any]],
+    lang: str,
+) -> Tuple[List[str], int]:
+    """Return (source values whose output lacks enough target script, number of non-None values checked)."""
+    bad: List[str] = []
+    checked = 0
+    for src_item, out_item in zip(src_list, out_list):
+        for k, v in out_item.items():
+            if v is None:
+                continue
+            checked += 1
+            if isinstance(v, str) and v and not v.isspace() and not _has_target_script(v, lang):
+                bad.append(src_item.get(k) or "")
+    return bad, checked
+
+
+def _check_script_share(bad_cells: List[str], total_checked: int, lang: str):
+    """Raise TranslationError if, after the strict retry, too many cells still lack the target script."""
+    if total_checked > 0 and len(bad_cells) / total_checked > MAX_TRANSLITERATED_SHARE:
+        raise TranslationError(
+            f"{len(bad_cells)} of {total_checked} values still not in the {lang} script after a strict retry"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_prefix(kind: str, lang: str, strict: bool = False) -> Tuple[str, ...]:
+    """
+    Constant leading prompt parts for a request kind ("fields" or "items") and language,
+    built once; callers append only the serialized payload.
+    """
+    parts = (
+        SYSTEM_PROMPT,
+        f"Target language code: {lang}",
+        SCRIPT_HINTS.get(lang, ""),
+        PROMPT_INSTRUCTIONS[kind],
+        f"{kind}:",
+    )
+    return (STRICT_PREFIX,) + parts if strict else parts
+
+
+def response_schema(fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """
+    Structured-output schema enforced at decode time: {"items": [str, ...]} for batch
+    requests, or an object with the given (nullable) string fields for single-record ones.
+    """
+    if fields is None:
+        return {
+            "type": "OBJECT",
+            "properties": {"items": {"type": "ARRAY", "items": {"type": "STRING"}}},
+            "required": ["items"],
+        }
+    return {
+        "type": "OBJECT",
+        "properties": {k: {"type": "STRING", "nullable": True} for k in fields},
+        "required": list(fields),
+        "property_ordering": list(fields),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def generation_config(fields: Optional[Tuple[str, ...]] = None):
+    """Build each request config once; genai is only importable after main() loads it."""
+    return genai.types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=response_schema(fields),
+        temperature=0.2,
+    )
+
+
+def generate(client, content: List[str], fields: Optional[Tuple[str, ...]] = None):
+    """
+    Send one generate_content request on the given client (the single genai.Client built in
+    main()), holding a slot so at most TRANSLATE_WORKERS are in flight and drawing a token
+    from the rate limiter. fields selects the response schema (see response_schema).
+    """
+    with _REQUEST_SLOTS:
+        _RATE_LIMITER.acquire()
+        return client.models.generate_content(
+            model=MODEL_NAME,
+            contents=content,
+            config=generation_config(fields),
+        )
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Rate limiting (429), server errors (5xx) and network failures are worth retrying."""
+    code = getattr(exc, "code", None)  # google.genai.errors.APIError
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    if isinstance(exc, (ConnectionError, TimeoutError)):
         return True
-    return False
+    # httpx is google-genai's transport; only importable once the SDK is installed
+    try:
+        import httpx  # type: ignore
+    except ImportError:
+        return False
+    return isinstance(exc, httpx.TransportError)
+
+
+def generate_json(client, content: List[str], parse: Callable[[Any], Any], fields: Optional[Tuple[str, ...]] = None):
+    """
+    Request JSON and return parse(decoded response), retrying with capped exponential
+    backoff and jitter on transient API errors, undecodable JSON, or parse() returning None.
+    Raises TranslationError once MAX_ATTEMPTS are used up, so failures never pass silently
+    as untranslated output.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            response = generate(client, content, fields)
+            result = parse(loads_json((response.text or "").strip()))
+            if result is not None:
+                return result
+            problem = "response did not match the expected shape"
+        except json.JSONDecodeError as e:
+            problem = f"invalid JSON in response: {e}"
+        except Exception as e:
+            if not _is_transient(e):
+                raise
+            problem = str(e)
+        if attempt == MAX_ATTEMPTS:
+            raise TranslationError(f"Gemini request failed after {MAX_ATTEMPTS} attempts: {problem}")
+        time.sleep(min(BACKOFF_MAX_SECONDS, BACKOFF_INITIAL_SECONDS * 2 ** (attempt - 1)) + random.uniform(0, 1))
 
 
 def translate_fields(
@@ -149,55 +535,30 @@ def translate_fields(
     payload: Dict[str, Any],
     target_lang: str,
     keys: List[str],
+    payload_json: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Legacy helper kept for potential reuse. Not used by the new batch flow.
-    Performs a single-record translation request.
+    Performs a single-record translation request (used by --mode single).
+    payload_json (dumps_compact(payload)) may be passed in to share it across languages.
     """
-    # Common content to send
-    base_content = [
-        SYSTEM_PROMPT,
-        f"Target language code: {target_lang}",
-        SCRIPT_HINTS.get(target_lang, ""),
-        "Translate the JSON values in 'fields' to the target language using its native script.\n"
-        "Return ONLY the translated 'fields' object as strict JSON with exactly the same keys.",
-        "fields:",
-        json.dumps(payload, ensure_ascii=False),
-    ]
+    # Nothing to translate (e.g. a holiday with every meal empty): skip the round-trip
+    if not any(isinstance(v, str) and v.strip() for v in payload.values()):
+        return dict(payload)
+    if payload_json is None:
+        payload_json = dumps_compact(payload)
+
+    def _parse(translated: Any) -> Optional[Dict[str, Any]]:
+        # The response schema fixes the shape to exactly these keys
+        if not isinstance(translated, dict):
+            return None
+        return {k: translated.get(k) for k in keys}
 
     def _invoke(stronger: bool = False) -> Dict[str, Any]:
-        content = list(base_content)
-        if stronger:
-            content.insert(
-                0,
-                "STRICT: Use only the native script (no Latin letters) for words. Keep numbers and punctuation as-is.",
-            )
-        response = gemini_client.models.generate_content(
-            model=MODEL_NAME,
-            contents=content,
-            config=genai.types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.2,
-            )
-        )
-        text = (response.text or "").strip()
-        try:
-            translated = json.loads(text)
-            # If the model wraps in an object, try to access 'fields'
-            if isinstance(translated, dict) and all(k in translated for k in keys):
-                return {k: translated[k] for k in keys}
-            if isinstance(translated, dict) and "fields" in translated and isinstance(translated["fields"], dict):
-                inner = translated["fields"]
-                if all(k in inner for k in keys):
-                    return {k: inner[k] for k in keys}
-            return {}
-        except json.JSONDecodeError:
-            return {}
-
-    # First attempt
+        content = [*prompt_prefix("fields", target_lang, stronger), payload_json]
+        return generate_json(model, content, _parse, tuple(keys))
+
+    # First attempt; a persistent failure raises instead of falling back to English
     out = _invoke(stronger=False)
-    if not out:
-        out = payload.copy()
     # Validate for transliteration issues; retry once if needed
     needs_retry = any(
         isinstance(v, str) and len(v) > 0 and not _has_target_script(v, target_lang)
@@ -205,9 +566,13 @@ def translate_fields(
         if v is not None
     )
     if needs_retry:
-        retry = _invoke(stronger=True)
-        if retry:
-            out = retry
+        try:
+            out = _invoke(stronger=True)
+        except Exception:
+            # The retry is optional: keep the first translation if it fails for any reason
+            pass
+        bad_cells, total_checked = _transliterated_cells([payload], [out], target_lang)
+        _check_script_share(bad_cells, total_checked, target_lang)
     # Ensure missing keys are filled from payload
     for k in keys:
         if k not in out or out[k] is None:
@@ -215,158 +580,319 @@ def translate_fields(
     return out
 
 
+def unique_menu_lines(payload_list: List[Dict[str, Any]]) -> List[str]:
+    """
+    Distinct non-blank lines across all payload values, in first-seen order.
+
+    Menu cells rarely repeat as a whole, but their lines ("Tea / Coffee / Milk",
+    "Curd", ...) recur across days, so lines are the unit sent for translation.
+    """
+    seen: Dict[str, None] = {}
+    for item in payload_list:
+        for v in item.values():
+            if isinstance(v, str):
+                for line in v.split("\n"):
+                    if line and not line.isspace():
+                        seen[line] = None
+    return list(seen)
+
+
+def build_batch_payload(records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Build the minimal payload (only TRANSLATABLE_FIELDS) for a batch request and the
+    serialized JSON of its unique lines. Both are language-independent, so callers
+    compute them once per file.
+    """
+    # Build minimal payload of only translatable fields to avoid any accidental edits.
+    payload_list: List[Dict[str, Any]] = [build_translation_payload(rec, TRANSLATABLE_FIELDS) for rec in records]
+    return payload_list, dumps_compact(unique_menu_lines(payload_list))
+
+
+def build_record_jsons(payload_list: List[Dict[str, Any]]) -> List[str]:
+    """Serialized request JSON of each record payload for --mode single; language-independent."""
+    return [dumps_compact(item) for item in payload_list]
+
+
 def translate_menu_batch(
     model,
-    records: List[Dict[str, Any]],
+    payload_list: List[Dict[str, Any]],
     target_lang: str,
+    payload_json: Optional[str] = None,
+    use_line_cache: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     Translate all menu records in ONE API REQUEST for a given language.
 
+    Each distinct line is translated once and substituted back into every cell that
+    contains it. Takes the payload from build_batch_payload (payload_json is derived
+    if omitted); use_line_cache=False ignores cached lines (new ones are still stored).
     Returns a list of dicts with translated values for TRANSLATABLE_FIELDS,
     preserving array length and order.
     """
-    keys = TRANSLATABLE_FIELDS
-    # Build minimal payload of only translatable fields to avoid any accidental edits.
-    payload_list: List[Dict[str, Any]] = []
-    for rec in records:
-        item: Dict[str, Any] = {}
-        for k in keys:
-            val = rec.get(k)
-            item[k] = (str(val) if val is not None else None)
-        payload_list.append(item)
-
-    # Compose the prompt content
-    base_content = [
-        SYSTEM_PROMPT,
-        f"Target language code: {target_lang}",
-        SCRIPT_HINTS.get(target_lang, ""),
-        (
-            "You will receive an array named 'records'. Each item has keys: "
-            f"{', '.join(keys)}. Translate ONLY the values to the target language using its native script. "
-            "Keep numbers, commas, slashes, hyphens, and parentheses exactly as-is. "
-            "Do NOT add or remove items, do NOT reorder, and return EXACTLY a JSON object with key 'records' "
-            "whose value is an array of the same length of objects with the SAME keys."
-        ),
-        "records:",
-        json.dumps(payload_list, ensure_ascii=False),
-    ]
-
-    def _invoke(stronger: bool = False) -> List[Dict[str, Any]]:
-        content = list(base_content)
-        if stronger:
-            content.insert(
-                0,
-                "STRICT: Use only the native script (no Latin letters) for words. Keep numbers and punctuation as-is.",
-            )
-        response = gemini_client.models.generate_content(
-            model=MODEL_NAME,
-            contents=content,
-            config=genai.types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.2,
-            )
-        )
-        text = (response.text or "").strip()
-        try:
-            obj = json.loads(text)
-        except json.JSONDecodeError:
-            return []
-        # Accept either {"records": [...]} or just [...]
-        recs = None
-        if isinstance(obj, dict) and isinstance(obj.get("records"), list):
-            recs = obj.get("records")
-        elif isinstance(obj, list):
-            recs = obj
-        else:
-            return []
-        # Validate structure: list of dicts with required keys
-        if not isinstance(recs, list) or len(recs) != len(payload_list):
-            return []
-        cleaned: List[Dict[str, Any]] = []
-        for item in recs:
-            if not isinstance(item, dict):
-                return []
-            cleaned.append({k: item.get(k) for k in keys})
-        return cleaned
-
-    # First attempt in one request
-    out_list = _invoke(stronger=False)
-    if not out_list:
-        # fallback to original payload (no translation)
-        out_list = payload_list
+    lines = unique_menu_lines(payload_list)
+    if not lines:
+        return [dict(item) for item in payload_list]
+    if payload_json is None:
+        payload_json = dumps_compact(lines)
+
+    def _invoke(batch_json: str, expected: int, stronger: bool = False) -> List[str]:
+        def _parse(obj: Any) -> Optional[List[str]]:
+            # The response schema guarantees {"items": [str, ...]}; only the length can still differ
+            items = obj.get("items") if isinstance(obj, dict) else None
+            if not isinstance(items, list) or len(items) != expected:
+                return None
+            return items
+
+        content = [*prompt_prefix("items", target_lang, stronger), batch_json]
+        return generate_json(model, content, _parse)
+
+    def _apply(translation_map: Dict[str, str]) -> List[Dict[str, Any]]:
+        # Substitute translated lines back into every cell; untranslated and blank lines stay as-is
+        return [
+            {
+                k: ("\n".join(translation_map.get(line, line) for line in v.split("\n")) if isinstance(v, str) else v)
+                for k, v in item.items()
+            }
+            for item in payload_list
+        ]
+
+    # Lines already translated in earlier files/runs come from the line cache; only misses are sent
+    cached = cached_line_translations(lines, target_lang) if use_line_cache else {}
+    translation_map: Dict[str, str] = dict(cached)
+    misses = [line for line in lines if line not in translation_map]
+    if misses:
+        # First attempt: every uncached unique line in one request; a persistent failure raises
+        misses_json = payload_json if len(misses) == len(lines) else dumps_compact(misses)
+        translation_map.update(zip(misses, _invoke(misses_json, len(misses))))
+    out_list = _apply(translation_map)
     # Check for transliteration issues; if too many look wrong, retry once stronger
-    bad_count = 0
-    total_checked = 0
-    for item in out_list:
-        for v in item.values():
-            if v is None:
-                continue
-            total_checked += 1
-            if isinstance(v, str) and v.strip():
-                if not _has_target_script(v, target_lang):
-                    bad_count += 1
-    # Retry if more than 25% of checked values appear transliterated
-    if total_checked > 0 and bad_count / total_checked > 0.25:
-        retry = _invoke(stronger=True)
+    bad_cells, total_checked = _transliterated_cells(payload_list, out_list, target_lang)
+    # Retry if too many checked values appear transliterated, resending only the failed cells' lines
+    if total_checked > 0 and len(bad_cells) / total_checked > MAX_TRANSLITERATED_SHARE:
+        retry_lines = unique_menu_lines([{"v": v} for v in bad_cells])
+        try:
+            retry = _invoke(dumps_compact(retry_lines), len(retry_lines), stronger=True)
+        except Exception:
+            # The retry is optional: keep the first translation if it fails for any reason
+            retry = []
         if retry:
-            out_list = retry
-    # Ensure all mandatory keys present; fill missing with source
-    fixed: List[Dict[str, Any]] = []
-    for src_item, out_item in zip(payload_list, out_list):
-        merged: Dict[str, Any] = {}
-        for k in keys:
-            val = out_item.get(k) if isinstance(out_item, dict) else None
-            if val is None:
-                val = src_item.get(k)
-            merged[k] = val
-        fixed.append(merged)
-    return fixed
-
-
-def translate_record(model, record: Dict[str, Any], lang: str) -> Dict[str, Any]:
-    """Single-record translation (unused in batch flow). Kept for completeness."""
-    out = dict(record)
-    payload = build_translation_payload(record, TRANSLATABLE_FIELDS)
-    translated = translate_fields(model, payload, lang, TRANSLATABLE_FIELDS)
-    for k, v in translated.items():
-        out[k] = v
-    return out
+            translation_map.update(zip(retry_lines, retry))
+            out_list = _apply(translation_map)
+            bad_cells, _ = _transliterated_cells(payload_list, out_list, target_lang)
+    # Cache only lines that pass the script check on their own: a cell can pass as a whole
+    # while one of its lines came back in English, which must not be served again later
+    store_line_translations(
+        {
+            line: t
+            for line, t in translation_map.items()
+            if cached.get(line) != t and _has_target_script(t, target_lang)
+        },
+        target_lang,
+    )
+    _check_script_share(bad_cells, total_checked, target_lang)
+    return out_list
 
 
-def translate_file(src_path: str, langs: List[str]) -> Dict[str, str]:
-    base = os.path.basename(src_path)
-    data = load_json(src_path)
+def translate_records_concurrently(
+    client,
+    payload_list: List[Dict[str, Any]],
+    lang: str,
+    record_jsons: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Translate each record with its own request (--mode single), overlapping the requests.
 
-    results = {}
-    for lang in langs:
-        translated_data = dict(data)
-        src_list: List[Dict[str, Any]] = list(data.get("list", []))
+    record_jsons (from build_record_jsons) are derived if omitted. Results keep the input
+    order; the shared request slots bound total concurrency.
+    """
+    if not payload_list:
+        return []
+    if record_jsons is None:
+        record_jsons = build_record_jsons(payload_list)
+    with ThreadPoolExecutor(max_workers=min(len(payload_list), TRANSLATE_WORKERS)) as ex:
+        return list(ex.map(
+            lambda item, item_json: translate_fields(client, item, lang, TRANSLATABLE_FIELDS, item_json),
+            payload_list,
+            record_jsons,
+        ))
+
+
+def translate_file_lang(
+    client,
+    src_path: str,
+    lang: str,
+    data: Optional[Dict[str, Any]] = None,
+    payload: Optional[Tuple[List[Dict[str, Any]], str]] = None,
+    mode: str = "batch",
+    force: bool = False,
+    cache_key: Optional[str] = None,
+    record_jsons: Optional[List[str]] = None,
+) -> str:
+    """
+    Translate one menu file into one language with client and save it; returns the output path.
+
+    mode "batch" sends the whole file in one request; "single" sends one request per record.
+    Outputs already written from the same source/lang/model/mode are skipped, and cached ones
+    copied, unless force is set.
+
+    data, payload (from build_batch_payload), cache_key and record_jsons (from
+    build_record_jsons) may be passed in so that several languages share one read of
+    the source and one serialization of its request payloads.
+    """
+    out_path = output_path(src_path, lang)
+    if cache_key is None:
+        with open(src_path, "rb") as f:
+            cache_key = translation_cache_key(f.read(), lang, mode)
+    cache_path = translation_cache_path(cache_key)
+    if not force:
+        if is_up_to_date(out_path, cache_key):
+            return out_path
+        if os.path.exists(cache_path):
+            replace_with_copy(cache_path, out_path)
+            record_output(out_path, cache_key)
+            return out_path
+
+    if data is None:
+        data = load_json(src_path)
+
+    translated_data = dict(data)
+    src_list: List[Dict[str, Any]] = list(data.get("list", []))
+    payload_list, payload_json = payload if payload is not None else build_batch_payload(src_list)
+    if mode == "single":
+        translated_fields_list = translate_records_concurrently(client, payload_list, lang, record_jsons)
+    else:
         # ONE REQUEST per menu file per language
-        translated_fields_list = translate_menu_batch(gemini_client, src_list, lang)
-        # Merge translated fields back into full records (preserve Day and other keys)
-        merged_list: List[Dict[str, Any]] = []
-        for rec, tfields in zip(src_list, translated_fields_list):
-            new_rec = dict(rec)
-            for k in TRANSLATABLE_FIELDS:
-                if tfields is not None and isinstance(tfields, dict) and k in tfields:
-                    new_rec[k] = tfields[k]
-            # Explicitly preserve Day as-is from source
-            if "Day" in rec:
-                new_rec["Day"] = rec["Day"]
-            merged_list.append(new_rec)
-        translated_data["list"] = merged_list
-
-        out_path = os.path.join(OUT_DIRS[lang], base)
-        save_json(out_path, translated_data)
-        results[lang] = out_path
-    return results
+        translated_fields_list = translate_menu_batch(
+            client, payload_list, lang, payload_json, use_line_cache=not force
+        )
+    # Merge translated fields back into full records (preserve Day and other keys)
+    merged_list: List[Dict[str, Any]] = []
+    for rec, tfields in zip(src_list, translated_fields_list):
+        new_rec = dict(rec)
+        for k in TRANSLATABLE_FIELDS:
+            if tfields is not None and isinstance(tfields, dict) and k in tfields:
+                new_rec[k] = tfields[k]
+        # Explicitly preserve Day as-is from source
+        if "Day" in rec:
+            new_rec["Day"] = rec["Day"]
+        merged_list.append(new_rec)
+    translated_data["list"] = merged_list
+
+    save_json(out_path, translated_data)
+    # Failed requests raise, so anything reaching here is a finished translation (even if
+    # unchanged, e.g. blank or numbers-only cells) and is safe to cache and skip next run
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    replace_with_copy(out_path, cache_path)
+    record_output(out_path, cache_key)
+    return out_path
+
+
+class LoadedSource(NamedTuple):
+    """
+    One source as read by load_source. cache_keys maps each lang to its translation_cache_key;
+    data and payload are None when no language needs translating, record_jsons unless mode
+    is "single"; error is set (and everything else empty) if the source could not be read.
+    """
+
+    path: str
+    cache_keys: Dict[str, str]
+    data: Optional[Dict[str, Any]] = None
+    payload: Optional[Tuple[List[Dict[str, Any]], str]] = None
+    record_jsons: Optional[List[str]] = None
+    error: Optional[Exception] = None
+
+
+def load_source(path: str, langs: List[str], mode: str = "batch", force: bool = False) -> LoadedSource:
+    """
+    Read one source once for every language. It is only parsed and its payloads built if
+    some language is neither up to date nor cached.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        keys = {lang: translation_cache_key(raw, lang, mode) for lang in langs}
+        pending = force or any(
+            not is_up_to_date(output_path(path, lang), key) and not os.path.exists(translation_cache_path(key))
+            for lang, key in keys.items()
+        )
+        if not pending:
+            return LoadedSource(path, keys)
+        data = loads_json(raw)
+        payload = build_batch_payload(list(data.get("list", [])))
+        record_jsons = build_record_jsons(payload[0]) if mode == "single" else None
+        return LoadedSource(path, keys, data, payload, record_jsons)
+    except Exception as e:
+        return LoadedSource(path, {}, error=e)
+
+
+def translate_all(client, menu_files: List[str], langs: List[str], mode: str = "batch", force: bool = False):
+    """
+    Translate every (file, language) pair concurrently.
+
+    Each pair is one blocking Gemini request, so a bounded thread pool overlaps the
+    network latency while the shared client is reused across threads.
+
+    Threads rather than processes on purpose: the rate limiter, request slots, line
+    cache and manifest are all in-process state that worker processes would each
+    duplicate (multiplying the effective RPM), and the CPU work per file -- parsing,
+    payload assembly, script checks -- is small next to a single API round-trip.
+    """
+    if not menu_files or not langs:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(menu_files) * len(langs), TRANSLATE_WORKERS)) as ex, \
+            ThreadPool(min(len(menu_files), SOURCE_LOAD_WORKERS)) as loader:
+        futures = {}
+        # Read, hash, parse and serialize each source once (every language reuses it), reading ahead
+        # in parallel and submitting each file's tasks as soon as its source is ready
+        load = functools.partial(load_source, langs=langs, mode=mode, force=force)
+        for source in loader.imap(load, menu_files):
+            if source.error is not None:
+                print(f"{os.path.basename(source.path)}\n  !! Failed: {source.error}")
+                continue
+            for lang in langs:
+                fut = ex.submit(
+                    translate_file_lang,
+                    client,
+                    source.path,
+                    lang,
+                    data=source.data,
+                    payload=source.payload,
+                    mode=mode,
+                    force=force,
+                    cache_key=source.cache_keys[lang],
+                    record_jsons=source.record_jsons,
+                )
+                futures[fut] = (source.path, lang)
+        # Only files that loaded have tasks, so count those for the progress total
+        total = len(futures)
+        for idx, fut in enumerate(as_completed(futures), 1):
+            path, lang = futures[fut]
+            print(f"[{idx}/{total}] {os.path.basename(path)} -> {lang}")
+            try:
+                print(f"  -> {lang}: {fut.result()}")
+            except Exception as e:
+                print(f"  !! Failed: {e}")
+
+
+def list_src_files() -> Set[str]:
+    """Names of the regular files directly under SRC_DIR, from a single directory scan."""
+    try:
+        with os.scandir(SRC_DIR) as it:
+            return {e.name for e in it if e.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def list_src_json() -> List[str]:
+    """Sorted paths of the *.json files directly under SRC_DIR, from one os.scandir pass."""
+    return sorted(os.path.join(SRC_DIR, name) for name in list_src_files() if name.endswith(".json"))
 
 
 def read_lines_file(path: str) -> List[str]:
     try:
         with open(path, "r", encoding="utf-8") as f:
-            return [ln.strip() for ln in f.readlines() if ln.strip()]
+            # Iterate the file lazily and strip each line once
+            return [s for s in (ln.strip() for ln in f) if s]
     except FileNotFoundError:
         return []
 
@@ -377,6 +903,8 @@ def main():
     parser.add_argument("--files", nargs="*", help="Specific json/en/*.json files to process selectively")
     parser.add_argument("--from-file", dest="from_file", help="Path to a text file containing newline-separated json/en/*.json paths")
     parser.add_argument("--parity-only", action="store_true", help="Only ensure laundry JSON parity (copy -L files); do not translate")
+    parser.add_argument("--mode", choices=["batch", "single"], default="batch", help="batch: one request per file per language; single: one request per record")
+    parser.add_argument("--force", action="store_true", help="Re-translate even if outputs are up to date or cached")
     parser.add_argument("--no-ensure-laundry-parity", dest="ensure_parity", action="store_false", help="Do not perform laundry parity copying")
     parser.set_defaults(ensure_parity=True)
     args = parser.parse_args()
@@ -391,8 +919,19 @@ def main():
     if args.from_file:
         selected.extend(read_lines_file(args.from_file))
     # Normalize paths to use SRC_DIR base if relative
-    selected = [p if os.path.isabs(p) or p.startswith(SRC_DIR) else os.path.join(SRC_DIR, p) for p in selected]
-    selected = [p for p in selected if p and os.path.splitext(p)[1].lower() == ".json" and os.path.exists(p)]
+    prefixes = (SRC_DIR + os.sep, SRC_DIR + "/")
+    selected = [p if os.path.isabs(p) or p.startswith(prefixes) else os.path.join(SRC_DIR, p) for p in selected]
+    # One directory scan answers existence for most paths directly under SRC_DIR; anything not
+    # found by exact name (other dirs, or a different case on case-insensitive filesystems) is stat'ed
+    src_dirs = {SRC_DIR, SRC_DIR.replace(os.sep, "/")}
+    src_names = list_src_files()
+
+    def _exists(p: str) -> bool:
+        if os.path.dirname(p) in src_dirs and os.path.basename(p) in src_names:
+            return True
+        return os.path.exists(p)
+
+    selected = [p for p in selected if p and os.path.splitext(p)[1].lower() == ".json" and _exists(p)]
 
     # If parity-only is requested, copy laundry files and exit
     if args.parity_only:
@@ -400,17 +939,12 @@ def main():
         if selected:
             laundry = [p for p in selected if is_laundry_file(p)]
         else:
-            laundry = [p for p in glob.glob(os.path.join(SRC_DIR, "*.json")) if is_laundry_file(p)]
+            laundry = [p for p in list_src_json() if is_laundry_file(p)]
         if not laundry:
             print("No laundry JSON files to copy for parity.")
             return
         print(f"Copying {len(laundry)} laundry JSON files for parity -> {', '.join(langs)}")
-        for idx, path in enumerate(laundry, 1):
-            base = os.path.basename(path)
-            print(f"[{idx}/{len(laundry)}] {base}")
-            for lang in langs:
-                outp = copy_file(path, lang)
-                print(f"  -> {lang}: {outp}")
+        copy_parity_files(laundry, langs)
         print("\nDone (parity-only).")
         return
 
@@ -434,7 +968,7 @@ def main():
         menu_files = [p for p in selected if is_menu_file(p)]
         laundry_files = [p for p in selected if is_laundry_file(p)]
     else:
-        files = sorted(glob.glob(os.path.join(SRC_DIR, "*.json")))
+        files = list_src_json()
         menu_files = [f for f in files if is_menu_file(f)]
         laundry_files = []
 
@@ -446,26 +980,12 @@ def main():
 
     if menu_files:
         print(f"Translating {len(menu_files)} menu files to: {', '.join(langs)}")
-        for idx, path in enumerate(menu_files, 1):
-            print(f"[{idx}/{len(menu_files)}] {os.path.basename(path)}")
-            try:
-                out_map = translate_file(path, langs)
-                for lang, outp in out_map.items():
-                    print(f"  -> {lang}: {outp}")
-            except Exception as e:
-                print(f"  !! Failed: {e}")
-                # continue with next file
-                continue
+        translate_all(gemini_client, menu_files, langs, args.mode, args.force)
 
     # Optionally ensure laundry parity by copying selected laundry files (if any)
     if args.ensure_parity and laundry_files:
         print(f"Ensuring laundry parity for {len(laundry_files)} files -> {', '.join(langs)}")
-        for idx, path in enumerate(laundry_files, 1):
-            base = os.path.basename(path)
-            print(f"[L {idx}/{len(laundry_files)}] {base}")
-            for lang in langs:
-                outp = copy_file(path, lang)
-                print(f"  -> {lang}: {outp}")
+        copy_parity_files(laundry_files, langs, label="L ")
 
     print("\nDone.")
 